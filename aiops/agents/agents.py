@@ -1,7 +1,7 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Dict, Any, List
+from dataclasses import dataclass, fields
+from typing import Dict, Any, List, Tuple
 
 import numpy as np
 import pandas as pd
@@ -20,22 +20,79 @@ class WorldState:
 	delays: Dict[str, float]
 
 
+# Typed payloads for the events published every tick; attribute access avoids per-event dicts
+@dataclass(frozen=True)
+class WeatherUpdate:
+	__slots__ = ("wind", "rain")
+	wind: float
+	rain: int
+
+
+@dataclass(frozen=True)
+class FlightRequest:
+	__slots__ = ("flight_id", "op", "sched_min")
+	flight_id: str
+	op: str
+	sched_min: int
+
+
+@dataclass(frozen=True)
+class RunwayAssigned:
+	__slots__ = ("flight_id", "runway_id", "slot")
+	flight_id: str
+	runway_id: str
+	slot: int
+
+
+@dataclass(frozen=True)
+class RunwayDeferred:
+	__slots__ = ("flight_id", "delta_slots")
+	flight_id: str
+	delta_slots: int
+
+
+@dataclass(frozen=True)
+class GateAssigned:
+	__slots__ = ("flight_id", "gate_id", "slot")
+	flight_id: str
+	gate_id: str
+	slot: int
+
+
+# Columns of a flattened simulation log: event time and type, then the ordered union of the
+# payload fields, with payload types in the order they first appear in a run
+LOG_COLUMNS: List[str] = list(dict.fromkeys(
+	["time_min", "type"]
+	+ [f.name for cls in (WeatherUpdate, FlightRequest, RunwayAssigned, GateAssigned, RunwayDeferred) for f in fields(cls)]
+))
+
+
 class WeatherAgent(Agent):
 	def __init__(self, bus: EventBus, weather: pd.DataFrame):
 		super().__init__("WeatherAgent", bus)
-		self.weather = weather
+		self._wind = weather["wind"].to_numpy(np.float64)
+		self._rain = weather["rain"].to_numpy(np.int8)
+		self._n = len(weather)
 
 	def step(self, t_min: int) -> None:
-		row_idx = min(len(self.weather) - 1, t_min // 5)
-		wx = self.weather.iloc[row_idx]
-		self.bus.publish(Event("weather.update", {"wind": float(wx["wind"]), "rain": int(wx["rain"])}, t_min))
+		idx = min(self._n - 1, t_min // 5)
+		self.bus.publish(Event("weather.update", WeatherUpdate(float(self._wind[idx]), int(self._rain[idx])), t_min))
 
 
 class FlightAgent(Agent):
-	def __init__(self, bus: EventBus, flights: pd.DataFrame, delays: Dict[str, float], bias: Dict[str, float] | None = None):
+	def __init__(self, bus: EventBus, flights: pd.DataFrame, delays: np.ndarray, bias: Dict[str, float] | None = None):
 		super().__init__("FlightAgent", bus)
-		self.flights = flights
-		self.delays = delays
+		# delays: predicted minutes per flight, positionally aligned to the rows of flights
+		delays = np.asarray(delays, dtype=np.float64)
+		if len(delays) != len(flights):
+			raise ValueError(f"expected {len(flights)} delays, got {len(delays)}")
+		# Column arrays sorted by schedule so each tick's window is a searchsorted range;
+		# delays follow the same permutation
+		order = np.argsort(flights["sched_min"].to_numpy(), kind="stable")
+		self._sched = flights["sched_min"].to_numpy()[order]
+		self._fid = flights["flight_id"].to_numpy(object)[order]
+		self._op = flights["op"].to_numpy(object)[order]
+		self._delay_arr = delays[order].astype(np.int64)
 		self.bias: Dict[str, float] = {} if bias is None else dict(bias)
 		self.wx_extra_delay_min: float = 0.0
 		bus.subscribe("runway.deferred", self.on_deferred)
@@ -43,64 +100,121 @@ class FlightAgent(Agent):
 
 	def step(self, t_min: int) -> None:
 		# Emit requests for flights scheduled within next 10 minutes
-		window = self.flights[(self.flights["sched_min"] >= t_min) & (self.flights["sched_min"] < t_min + 10)]
-		for _, row in window.iterrows():
-			base = int(row["sched_min"]) + int(self.delays.get(row["flight_id"], 0))
-			bias = int(self.bias.get(row["flight_id"], 0))
-			req_sched = max(0, base + bias + int(self.wx_extra_delay_min))
-			req = {"flight_id": row["flight_id"], "op": row["op"], "sched_min": req_sched}
-			self.bus.publish(Event("flight.request", req, t_min))
+		lo = int(np.searchsorted(self._sched, t_min, side="left"))
+		hi = int(np.searchsorted(self._sched, t_min + 10, side="left"))
+		wx_extra = int(self.wx_extra_delay_min)
+		for i in range(lo, hi):
+			fid = self._fid[i]
+			base = int(self._sched[i]) + int(self._delay_arr[i])
+			bias = int(self.bias.get(fid, 0))
+			req_sched = max(0, base + bias + wx_extra)
+			self.bus.publish(Event("flight.request", FlightRequest(fid, self._op[i], req_sched), t_min))
 			self.record_decision()
 
 	def on_deferred(self, evt: Event) -> None:
-		fid = evt.payload["flight_id"]
-		delta_slots = int(evt.payload.get("delta_slots", 0))
+		fid = evt.payload.flight_id
+		delta_slots = evt.payload.delta_slots
 		# Learn by increasing bias when deferrals occur (half the deferral time in minutes)
 		self.bias[fid] = self.bias.get(fid, 0.0) + delta_slots * 5 * 0.5
 
 	def on_weather(self, evt: Event) -> None:
 		# Simple adaptive rule: when raining, expect +2 minutes extra
-		rain = int(evt.payload.get("rain", 0))
+		rain = evt.payload.rain
 		self.wx_extra_delay_min = 2.0 if rain == 1 else 0.0
 
 
+class _SlotGrid:
+	"""Dense slots x resources occupancy grid backing the greedy slot agents."""
+
+	def __init__(self, resources: List[str], n_slots: int) -> None:
+		self.resources = resources
+		self._busy = np.zeros((n_slots, len(resources)), dtype=bool)
+		self._assign: List[str | None] = [None] * (n_slots * len(resources))
+
+	def _ensure_slots(self, n_slots: int) -> None:
+		cur = self._busy.shape[0]
+		if n_slots <= cur:
+			return
+		grow = max(n_slots, 2 * cur) - cur
+		self._busy = np.vstack([self._busy, np.zeros((grow, len(self.resources)), dtype=bool)])
+		self._assign.extend([None] * (grow * len(self.resources)))
+
+	def claim(self, first_slot: int, span: int, owner: str) -> Tuple[int, str] | None:
+		# Earliest free (slot, resource) within [first_slot, first_slot + span), slot-major like the original scan
+		self._ensure_slots(first_slot + span)
+		free = ~self._busy[first_slot:first_slot + span].ravel()
+		if free.size == 0:
+			return None
+		k = int(free.argmax())
+		if not free[k]:
+			return None
+		n_res = len(self.resources)
+		s, r = first_slot + k // n_res, k % n_res
+		self._busy[s, r] = True
+		self._assign[s * n_res + r] = owner
+		return s, self.resources[r]
+
+	def rows(self) -> List[Tuple[int, str, str]]:
+		# (slot, resource, owner) for every claimed cell, slot-major
+		n_res = len(self.resources)
+		return [(int(s), self.resources[r], self._assign[s * n_res + r]) for s, r in np.argwhere(self._busy)]
+
+	def occupied(self) -> Dict[Tuple[int, str], str]:
+		return {(s, r): owner for s, r, owner in self.rows()}
+
+
 class RunwayAgent(Agent):
-	def __init__(self, bus: EventBus, runways: List[str]) -> None:
+	def __init__(self, bus: EventBus, runways: List[str], horizon_minutes: int = 240) -> None:
 		super().__init__("RunwayAgent", bus)
 		self.runways = runways
-		self.occupied: Dict[int, str] = {}
+		self._grid = _SlotGrid(runways, horizon_minutes // 5 + 4)
 		bus.subscribe("flight.request", self.on_request)
 
+	@property
+	def occupied(self) -> Dict[Tuple[int, str], str]:
+		# (slot, runway_id) -> flight_id, rebuilt from the slot grid on every access
+		return self._grid.occupied()
+
+	def rows(self) -> List[Tuple[int, str, str]]:
+		# (slot, runway_id, flight_id) per assignment, without building the occupied dict
+		return self._grid.rows()
+
 	def on_request(self, evt: Event) -> None:
 		# Greedy assign earliest free runway at requested or next slot
-		req_slot = evt.payload["sched_min"] // 5
-		for s in [req_slot, req_slot + 1, req_slot + 2]:
-			for r in self.runways:
-				if (s, r) not in self.occupied:
-					self.occupied[(s, r)] = evt.payload["flight_id"]
-					self.bus.publish(Event("runway.assigned", {"flight_id": evt.payload["flight_id"], "runway_id": r, "slot": s}, evt.time_min))
-					if s > req_slot:
-						self.bus.publish(Event("runway.deferred", {"flight_id": evt.payload["flight_id"], "delta_slots": s - req_slot}, evt.time_min))
-					self.record_decision()
-					return
+		req = evt.payload
+		req_slot = req.sched_min // 5
+		claimed = self._grid.claim(req_slot, 3, req.flight_id)
+		if claimed is None:
+			return
+		s, r = claimed
+		self.bus.publish(Event("runway.assigned", RunwayAssigned(req.flight_id, r, s), evt.time_min))
+		if s > req_slot:
+			self.bus.publish(Event("runway.deferred", RunwayDeferred(req.flight_id, s - req_slot), evt.time_min))
+		self.record_decision()
 
 
 class GateAgent(Agent):
-	def __init__(self, bus: EventBus, gates: pd.DataFrame) -> None:
+	def __init__(self, bus: EventBus, gates: pd.DataFrame, horizon_minutes: int = 240) -> None:
 		super().__init__("GateAgent", bus)
 		self.gates = list(gates["gate_id"]) if not gates.empty else ["G-1"]
-		self.occupied: Dict[int, str] = {}
+		self._grid = _SlotGrid(self.gates, horizon_minutes // 5 + 4)
 		bus.subscribe("runway.assigned", self.on_runway_assigned)
 
-	def on_runway_assigned(self, evt: Event) -> None:
-		flight_id = evt.payload["flight_id"]
-		slot = int(evt.payload["slot"])
-		for s in [slot, slot + 1, slot + 2]:
-			for g in self.gates:
-				if (s, g) not in self.occupied:
-					self.occupied[(s, g)] = flight_id
-					self.bus.publish(Event("gate.assigned", {"flight_id": flight_id, "gate_id": g, "slot": s}, evt.time_min))
-					self.record_decision()
-					return
+	@property
+	def occupied(self) -> Dict[Tuple[int, str], str]:
+		# (slot, gate_id) -> flight_id, rebuilt from the slot grid on every access
+		return self._grid.occupied()
 
+	def rows(self) -> List[Tuple[int, str, str]]:
+		# (slot, gate_id, flight_id) per assignment, without building the occupied dict
+		return self._grid.rows()
 
+	def on_runway_assigned(self, evt: Event) -> None:
+		flight_id = evt.payload.flight_id
+		slot = evt.payload.slot
+		claimed = self._grid.claim(slot, 3, flight_id)
+		if claimed is None:
+			return
+		s, g = claimed
+		self.bus.publish(Event("gate.assigned", GateAssigned(flight_id, g, s), evt.time_min))
+		self.record_decision()
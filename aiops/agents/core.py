@@ -1,27 +1,35 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import List, Dict, Callable, Any
+from typing import List, Dict, Callable, Any, Tuple
 
 
-@dataclass
+@dataclass(frozen=True)
 class Event:
+	# Declared by hand (not dataclass(slots=True)) to keep Python 3.9 support
+	__slots__ = ("type", "payload", "time_min")
 	type: str
-	payload: Dict[str, Any]
+	payload: Any  # one of the slotted payload dataclasses in aiops.agents.agents
 	time_min: int
 
 
 class EventBus:
 	def __init__(self) -> None:
-		self.subscribers: Dict[str, List[Callable[[Event], None]]] = {}
+		# Handlers are kept as tuples per event type so publish iterates a fixed sequence
+		self.subscribers: Dict[str, Tuple[Callable[[Event], None], ...]] = {}
 		self.log: List[Event] = []
+		self.num_events = 0
 
 	def subscribe(self, event_type: str, handler: Callable[[Event], None]) -> None:
-		self.subscribers.setdefault(event_type, []).append(handler)
+		self.subscribers[event_type] = self.subscribers.get(event_type, ()) + (handler,)
 
 	def publish(self, evt: Event) -> None:
+		self.num_events += 1
 		self.log.append(evt)
-		for handler in self.subscribers.get(evt.type, []):
+		handlers = self.subscribers.get(evt.type)
+		if handlers is None:
+			return
+		for handler in handlers:
 			handler(evt)
 
 
@@ -3,6 +3,7 @@ from __future__ import annotations
 from dataclasses import dataclass
 from typing import List, Dict
 
+import numpy as np
 import pandas as pd
 
 from aiops.config import Config
@@ -22,26 +23,29 @@ class AlertAgent:
 	def generate(self, delays: pd.Series, runway_assign: pd.DataFrame) -> List[Alert]:
 		alerts: List[Alert] = []
 		# Delay threshold alerts
-		for flight_id, d in delays.items():
-			if float(d) >= self.config.delay_alert_threshold:
-				alerts.append(Alert(
-					type="DELAY_THRESHOLD",
-					message=f"Flight {flight_id} predicted delay {float(d):.1f} min exceeds threshold",
-					meta={"flight_id": flight_id, "predicted_delay_min": f"{float(d):.1f}"},
-				))
+		values = delays.to_numpy(dtype=float)
+		over = values >= self.config.delay_alert_threshold
+		for flight_id, d in zip(delays.index[over], values[over]):
+			alerts.append(Alert(
+				type="DELAY_THRESHOLD",
+				message=f"Flight {flight_id} predicted delay {d:.1f} min exceeds threshold",
+				meta={"flight_id": flight_id, "predicted_delay_min": f"{d:.1f}"},
+			))
 
 		# Simple runway conflict alerts: same runway and adjacent slots (tight spacing)
 		if not runway_assign.empty:
-			df = runway_assign.copy().sort_values(["runway_id", "slot"]).reset_index(drop=True)
-			for i in range(1, len(df)):
-				prev = df.iloc[i - 1]
-				cur = df.iloc[i]
-				if prev["runway_id"] == cur["runway_id"] and (cur["slot"] - prev["slot"]) <= 0:
-					alerts.append(Alert(
-						type="RUNWAY_CONFLICT",
-						message=f"Potential runway conflict: {prev['flight_id']} and {cur['flight_id']} on {cur['runway_id']} at slot {cur['slot']}",
-						meta={"runway": str(cur["runway_id"]), "slot": str(int(cur["slot"]))},
-					))
+			df = runway_assign.sort_values(["runway_id", "slot"], ignore_index=True)
+			fids = df["flight_id"].to_numpy()
+			rwys = df["runway_id"].to_numpy()
+			slots = df["slot"].to_numpy()
+			same_rwy = rwys[1:] == rwys[:-1]
+			tight = np.diff(slots) <= 0
+			for i in np.flatnonzero(same_rwy & tight) + 1:
+				alerts.append(Alert(
+					type="RUNWAY_CONFLICT",
+					message=f"Potential runway conflict: {fids[i - 1]} and {fids[i]} on {rwys[i]} at slot {slots[i]}",
+					meta={"runway": str(rwys[i]), "slot": str(int(slots[i]))},
+				))
 
 		return alerts
 
@@ -8,6 +8,9 @@ from typing import Tuple
 from aiops.config import Config
 
 
+_AIRCRAFT = np.array(["NARROW", "WIDE"])
+
+
 @dataclass
 class IngestedData:
 	flights: pd.DataFrame
@@ -32,7 +35,8 @@ class DataIngestion:
 			),
 		)
 		arr_or_dep = np.random.choice(["ARR", "DEP"], size=self.config.num_flights, p=[0.5, 0.5])
-		aircraft_type = np.random.choice(["NARROW", "WIDE"], size=self.config.num_flights, p=[0.8, 0.2])
+		# 20% wide-bodies, drawn as 0/1 and mapped through a two-entry lookup
+		aircraft_type = _AIRCRAFT[np.random.binomial(1, 0.2, size=self.config.num_flights)]
 
 		flights = pd.DataFrame(
 			{
@@ -40,16 +44,17 @@ class DataIngestion:
 				"sched_min": scheduled_times,
 				"op": arr_or_dep,
 				"aircraft": aircraft_type,
-			}
+			},
+			copy=False,
 		)
 
-		runways = pd.DataFrame({"runway_id": [f"RWY-{i+1}" for i in range(self.config.num_runways)]})
-		gates = pd.DataFrame({"gate_id": [f"G-{i+1}" for i in range(self.config.num_gates)], "compatible": np.random.choice(["NARROW", "WIDE"], size=self.config.num_gates, p=[0.7, 0.3])})
+		runways = pd.DataFrame({"runway_id": [f"RWY-{i+1}" for i in range(self.config.num_runways)]}, copy=False)
+		gates = pd.DataFrame({"gate_id": [f"G-{i+1}" for i in range(self.config.num_gates)], "compatible": np.random.choice(["NARROW", "WIDE"], size=self.config.num_gates, p=[0.7, 0.3])}, copy=False)
 
 		weather_time = np.arange(0, self.config.planning_horizon_minutes, self.config.time_slot_minutes)
 		wind = np.random.normal(10, 3, size=len(weather_time))
 		rain = np.random.binomial(1, 0.2, size=len(weather_time))
-		weather = pd.DataFrame({"minute": weather_time, "wind": wind, "rain": rain})
+		weather = pd.DataFrame({"minute": weather_time, "wind": wind, "rain": rain}, copy=False)
 
 		return IngestedData(flights=flights, runways=runways, gates=gates, weather=weather)
 
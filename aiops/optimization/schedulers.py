@@ -5,7 +5,8 @@ from typing import Dict, List, Tuple
 
 import numpy as np
 import pandas as pd
-import pulp
+from scipy.optimize import Bounds, LinearConstraint, milp
+from scipy.sparse import coo_matrix
 
 
 @dataclass
@@ -17,6 +18,62 @@ class ScheduleResult:
 	status: str
 
 
+# scipy.optimize.milp status codes mapped onto the status strings callers already see
+_MILP_STATUS = {0: "Optimal", 1: "Not Solved", 2: "Infeasible", 3: "Unbounded"}
+
+
+def _milp_status(res) -> str:
+	if res.status == 1 and res.x is not None:
+		return "Feasible"
+	return _MILP_STATUS.get(res.status, "Undefined")
+
+
+def _bucket_rows(var_cols: np.ndarray, res: np.ndarray, off: np.ndarray, n_res: int, n_slots: int, window: int) -> Tuple[np.ndarray, np.ndarray, int]:
+	# At most one variable per (resource, slot) bucket, plus for each d in 1..window
+	# at most one across buckets s and s + d. Returns (row, col) indices and row count,
+	# keeping only rows that touch two or more variables (one alone is already <= 1).
+	block = n_res * n_slots
+	bucket = res * n_slots + off
+	rows = [bucket]
+	cols = [var_cols]
+	for d in range(1, window + 1):
+		base = d * block
+		fwd = off + d < n_slots
+		rows.append(base + bucket[fwd])
+		cols.append(var_cols[fwd])
+		back = off - d >= 0
+		rows.append(base + bucket[back] - d)
+		cols.append(var_cols[back])
+	rows = np.concatenate(rows)
+	cols = np.concatenate(cols)
+	keep = np.bincount(rows, minlength=(window + 1) * block)[rows] >= 2
+	used, rows = np.unique(rows[keep], return_inverse=True)
+	return rows, cols[keep], len(used)
+
+
+@dataclass
+class _MilpModel:
+	# Variable index arrays (x: flight, runway, slot; g: flight, gate) plus the fixed constraints
+	xi: np.ndarray
+	xr: np.ndarray
+	xs: np.ndarray
+	gi: np.ndarray
+	gk: np.ndarray
+	constraints: LinearConstraint
+	bounds: Bounds
+
+
+def _taxiway_conflicts(runway_df: pd.DataFrame) -> pd.DataFrame:
+	# Every pair of flights sharing a (runway, slot), in assignment order within the group
+	keys = ["runway_id", "slot"]
+	df = runway_df.sort_values(keys, kind="stable")
+	df = df[df.groupby(keys, sort=False)["flight_id"].transform("size") > 1]
+	df = df.assign(pos=df.groupby(keys, sort=False).cumcount())
+	pairs = df.merge(df, on=keys, suffixes=("_a", "_b"))
+	pairs = pairs[pairs["pos_a"] < pairs["pos_b"]].sort_values(keys + ["pos_a", "pos_b"])
+	pairs["slot"] = pairs["slot"].astype(int)
+	return pairs[["flight_id_a", "flight_id_b", "runway_id", "slot"]].reset_index(drop=True)
+
 
 class RunwayGateScheduler:
 	def __init__(self, time_slot_minutes: int, runway_sep_minutes: int = 5, gate_turnaround_minutes: int = 15, enable_runway_sep: bool = True, enable_gate_turn: bool = True) -> None:
@@ -25,134 +82,114 @@ class RunwayGateScheduler:
 		self.gate_turn_slots = max(1, gate_turnaround_minutes // time_slot_minutes)
 		self.enable_runway_sep = enable_runway_sep
 		self.enable_gate_turn = enable_gate_turn
+		self._model_cache: Dict[tuple, _MilpModel] = {}
 
-	def _time_to_slot(self, minute: int) -> int:
-		return int(minute // self.slot_minutes)
+	def _build_model(self, slots: np.ndarray, n_rwy: int, allowed: np.ndarray) -> _MilpModel:
+		# Everything except the objective depends only on the slots, runway count and gate compatibility
+		n_flights, n_gate = allowed.shape
+		# Candidate slots per flight: allow s-1, s, s+1 within bounds
+		min_slot = max(0, int(slots.min()) - 1)
+		max_slot = int(slots.max()) + 1
+		n_slots = max_slot - min_slot + 1
+		cand_mat = slots[:, None] + np.array([-1, 0, 1])
+		cand_ok = (cand_mat >= min_slot) & (cand_mat <= max_slot)
+
+		# Variables: x[i, r, s] over candidate runway slots (ordered i, r, s), then g[i, k]
+		valid = np.broadcast_to(cand_ok[:, None, :], (n_flights, n_rwy, 3))
+		xi = np.broadcast_to(np.arange(n_flights)[:, None, None], valid.shape)[valid]
+		xr = np.broadcast_to(np.arange(n_rwy)[None, :, None], valid.shape)[valid]
+		xs = np.broadcast_to(cand_mat[:, None, :], valid.shape)[valid]
+		nx = len(xi)
+		gi = np.repeat(np.arange(n_flights), n_gate)
+		gk = np.tile(np.arange(n_gate), n_flights)
+		ng = len(gi)
+		# Incompatible gates are fixed to 0 through the variable bounds
+		upper = np.concatenate([np.ones(nx), allowed.ravel().astype(float)])
+
+		# Constraints
+		# Each flight assigned to exactly one runway slot and exactly one gate
+		rows = [xi, n_flights + gi]
+		cols = [np.arange(nx), nx + np.arange(ng)]
+		n_rows = 2 * n_flights
+		lower = [np.ones(n_rows)]
+
+		# Runway capacity (+ separation window) and gate capacity (+ turnaround window)
+		rwy_window = self.runway_sep_slots if self.enable_runway_sep else 0
+		gate_window = self.gate_turn_slots if self.enable_gate_turn else 0
+		for var_cols, res_idx, off, n_res, window in (
+			(np.arange(nx), xr, xs - min_slot, n_rwy, rwy_window),
+			(nx + np.arange(ng), gk, slots[gi] - min_slot, n_gate, gate_window),
+		):
+			r_idx, c_idx, n_block = _bucket_rows(var_cols, res_idx, off, n_res, n_slots, window)
+			rows.append(n_rows + r_idx)
+			cols.append(c_idx)
+			lower.append(np.full(n_block, -np.inf))
+			n_rows += n_block
+
+		rows = np.concatenate(rows)
+		cols = np.concatenate(cols)
+		A = coo_matrix((np.ones(len(rows)), (rows, cols)), shape=(n_rows, nx + ng)).tocsr()
+		return _MilpModel(
+			xi=xi, xr=xr, xs=xs, gi=gi, gk=gk,
+			constraints=LinearConstraint(A, np.concatenate(lower), np.ones(n_rows)),
+			bounds=Bounds(np.zeros(nx + ng), upper),
+		)
 
 	def optimize(self, flights: pd.DataFrame, runways: pd.DataFrame, gates: pd.DataFrame, delay_minutes: pd.Series) -> ScheduleResult:
-		# Discretize time into slots and create a small MILP
-		flights = flights.copy().reset_index(drop=True)
-		flights["slot"] = flights["sched_min"].apply(self._time_to_slot)
-		# Candidate slots per flight: allow s-1, s, s+1 within bounds
-		min_slot = max(0, int(flights["slot"].min()) - 1)
-		max_slot = int(flights["slot"].max()) + 1
+		# Discretize time into slots and create a small MILP (solved by HiGHS via scipy)
+		slots = (flights["sched_min"].to_numpy() // self.slot_minutes).astype(int)
 
 		rwy_list = list(runways["runway_id"]) if len(runways) > 0 else ["RWY-1"]
 		gate_list = list(gates["gate_id"]) if len(gates) > 0 else ["G-1"]
-		compat = {row["gate_id"]: row["compatible"] for _, row in gates.iterrows()}
-
-		prob = pulp.LpProblem("RunwayGateScheduling", pulp.LpMinimize)
-
-		# Variables
-		x = pulp.LpVariable.dicts(
-			"x",
-			((i, r, s)
-			 for i in flights.index
-			 for r in rwy_list
-			 for s in [s for s in [flights.loc[i, "slot"] - 1, flights.loc[i, "slot"], flights.loc[i, "slot"] + 1] if s >= min_slot and s <= max_slot]),
-			0, 1, pulp.LpBinary,
+
+		# Gate compatibility (flight x gate): exact match, or narrow-body at a wide gate
+		compat = gates["compatible"].to_numpy(object) if len(gates) > 0 else np.array(["NARROW"], dtype=object)
+		aircraft = flights["aircraft"].to_numpy(object)[:, None]
+		allowed = (aircraft == compat[None, :]) | ((compat[None, :] == "WIDE") & (aircraft == "NARROW"))
+		# if no compatible gates, allow any gate (fallback)
+		allowed[~allowed.any(axis=1)] = True
+
+		# Reuse the previous constraint structure when only the delays changed
+		key = (
+			slots.tobytes(), len(rwy_list), allowed.shape, allowed.tobytes(),
+			self.enable_runway_sep, self.runway_sep_slots, self.enable_gate_turn, self.gate_turn_slots,
 		)
-		g = pulp.LpVariable.dicts("g", ((i, k) for i in flights.index for k in gate_list), 0, 1, pulp.LpBinary)
+		model = self._model_cache.get(key)
+		if model is None:
+			model = self._build_model(slots, len(rwy_list), allowed)
+			self._model_cache = {key: model}
+		xi, xr, xs, gi, gk = model.xi, model.xr, model.xs, model.gi, model.gk
+		nx = len(xi)
 
 		# Objective: minimize delay proximity + simple spreading on runways
 		flight_delay = delay_minutes.reindex(flights["flight_id"]).fillna(delay_minutes.mean())
-		objective_terms = []
-		for i in flights.index:
-			s_sched = flights.loc[i, "slot"]
-			for r in rwy_list:
-				for s in [s for s in [s_sched - 1, s_sched, s_sched + 1] if s >= min_slot and s <= max_slot]:
-					# penalty: moving from scheduled slot + predicted delay
-					objective_terms.append((abs(s - s_sched) + float(flight_delay.iloc[i]) / 10.0) * x[(i, r, s)])
-		prob += pulp.lpSum(objective_terms)
+		delay_pen = flight_delay.to_numpy(dtype=float) / 10.0
+		# penalty: moving from scheduled slot + predicted delay
+		c = np.concatenate([np.abs(xs - slots[xi]) + delay_pen[xi], np.zeros(len(gi))])
 
-		# Constraints
-		# Each flight assigned to exactly one runway slot
-		for i in flights.index:
-			cand = [s for s in [flights.loc[i, "slot"] - 1, flights.loc[i, "slot"], flights.loc[i, "slot"] + 1] if s >= min_slot and s <= max_slot]
-			prob += pulp.lpSum(x[(i, r, s)] for r in rwy_list for s in cand) == 1
-
-		# Runway capacity + separation: at most 1 per slot and enforce separation window
-		all_slots = list(range(min_slot, max_slot + 1))
-		for r in rwy_list:
-			for s in all_slots:
-				# capacity
-				prob += pulp.lpSum(x[(i, r, s)] for i in flights.index if (i, r, s) in x) <= 1
-				# separation: if enabled, block adjacent slots within sep window
-				if self.enable_runway_sep:
-					for d in range(1, self.runway_sep_slots + 1):
-						if (s + d) in all_slots:
-							prob += (
-								pulp.lpSum(x[(i, r, s)] for i in flights.index if (i, r, s) in x)
-								+
-								pulp.lpSum(x[(i, r, s + d)] for i in flights.index if (i, r, s + d) in x)
-								<= 1
-							)
-
-		# Gate assignment: one gate per flight, must match compatibility
-		for i in flights.index:
-			aircraft = flights.loc[i, "aircraft"]
-			compatible_gates = [k for k in gate_list if compat.get(k, "NARROW") == aircraft or (compat.get(k, "NARROW") == "WIDE" and aircraft == "NARROW")]
-			if not compatible_gates:
-				# if no compatible gates, allow any gate (fallback)
-				compatible_gates = gate_list
-			prob += pulp.lpSum(g[(i, k)] for k in compatible_gates) == 1
-			# disallow incompatible explicitly
-			for k in gate_list:
-				if k not in compatible_gates:
-					prob += g[(i, k)] == 0
-
-		# Gate capacity with turnaround: enforce gap between flights on same gate
-		for k in gate_list:
-			for s in all_slots:
-				# capacity at s (one per bucket)
-				prob += pulp.lpSum(g[(i, k)] for i in flights.index if flights.loc[i, "slot"] == s) <= 1
-				# turnaround window: if enabled, block s+d buckets
-				if self.enable_gate_turn:
-					for d in range(1, self.gate_turn_slots + 1):
-						if (s + d) in all_slots:
-							prob += (
-								pulp.lpSum(g[(i, k)] for i in flights.index if flights.loc[i, "slot"] == s)
-								+
-								pulp.lpSum(g[(i, k)] for i in flights.index if flights.loc[i, "slot"] == s + d)
-								<= 1
-							)
-
-		status = prob.solve(pulp.PULP_CBC_CMD(msg=False))
-		status_str = pulp.LpStatus[prob.status]
+		res = milp(c, constraints=model.constraints, integrality=np.ones(len(c)), bounds=model.bounds)
+		status_str = _milp_status(res)
 
 		# Extract solutions (only if solved feasibility)
 		runway_rows = []
 		gate_rows = []
 		if status_str in {"Optimal", "Feasible"}:
-			for i in flights.index:
-				for r in rwy_list:
-					for s in all_slots:
-						if (i, r, s) in x and pulp.value(x[(i, r, s)]) > 0.5:
-							runway_rows.append({"flight_id": flights.loc[i, "flight_id"], "runway_id": r, "slot": int(s)})
-			for i in flights.index:
-				for k in gate_list:
-					if pulp.value(g[(i, k)]) > 0.5:
-						gate_rows.append({"flight_id": flights.loc[i, "flight_id"], "gate_id": k})
+			fids = flights["flight_id"].to_numpy(object)
+			for j in np.flatnonzero(res.x[:nx] > 0.5):
+				runway_rows.append({"flight_id": fids[xi[j]], "runway_id": rwy_list[xr[j]], "slot": int(xs[j])})
+			for j in np.flatnonzero(res.x[nx:] > 0.5):
+				gate_rows.append({"flight_id": fids[gi[j]], "gate_id": gate_list[gk[j]]})
 
 
 		# Basic taxiway conflict heuristic: same runway same slot implies potential conflict pair
 		runway_df = pd.DataFrame(runway_rows)
-		taxi_conf_rows = []
-		if not runway_df.empty:
-			grp = runway_df.groupby(["runway_id", "slot"]).agg(list)
-			for (r, s), row in grp.iterrows():
-				fls = row["flight_id"]
-				if isinstance(fls, list) and len(fls) > 1:
-					for i in range(len(fls)):
-						for j in range(i + 1, len(fls)):
-							taxi_conf_rows.append({"flight_id_a": fls[i], "flight_id_b": fls[j], "runway_id": r, "slot": int(s)})
+		taxi_conf = _taxiway_conflicts(runway_df) if not runway_df.empty else pd.DataFrame()
 
 		return ScheduleResult(
 			runway_assignments=runway_df,
 			gate_assignments=pd.DataFrame(gate_rows),
-			taxiway_conflicts=pd.DataFrame(taxi_conf_rows),
-			objective_value=pulp.value(prob.objective) if prob.status == 1 else float("inf"),
+			taxiway_conflicts=taxi_conf,
+			objective_value=float(res.fun) if status_str == "Optimal" else float("inf"),
 			status=status_str,
 		)
 
-
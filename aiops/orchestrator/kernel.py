@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+from typing import Tuple
+
+import numpy as np
+
+try:
+	from numba import njit
+except ImportError:  # numba is optional; without it the kernel runs as plain Python
+	def njit(*args, **kwargs):
+		def wrap(fn):
+			return fn
+		return wrap
+
+
+# Array-only replay of the WeatherAgent/FlightAgent/RunwayAgent/GateAgent rules in
+# aiops.agents.agents, for callers that only need counts and learned biases.
+# Flights are integer-indexed in sched_min order; any change to the agents' rules
+# must be mirrored here.
+
+
+@njit(cache=True)
+def _grow(busy: np.ndarray, n_slots: int) -> np.ndarray:
+	out = np.zeros((max(n_slots, 2 * busy.shape[0]), busy.shape[1]), dtype=np.bool_)
+	out[:busy.shape[0]] = busy
+	return out
+
+
+@njit(cache=True)
+def _simulate(
+	sched: np.ndarray,
+	delay: np.ndarray,
+	bias: np.ndarray,
+	seen: np.ndarray,
+	stamp: int,
+	wx_rain: np.ndarray,
+	n_runways: int,
+	n_gates: int,
+	horizon: int,
+	step: int,
+) -> Tuple[int, int, int, int, int]:
+	"""Run one episode, updating ``bias`` in place.
+
+	``seen`` holds the order in which each flight was first deferred (-1 if never),
+	continuing from ``stamp``. Returns (requests, runway assignments, gate
+	assignments, events, next stamp).
+	"""
+	n_slots = horizon // 5 + 4
+	rwy_busy = np.zeros((n_slots, n_runways), dtype=np.bool_)
+	gate_busy = np.zeros((n_slots, n_gates), dtype=np.bool_)
+	n_req = 0
+	n_rwy = 0
+	n_gate = 0
+	n_events = 0
+	for t in range(0, horizon, step):
+		# WeatherAgent.step + FlightAgent.on_weather
+		wx_extra = 2 if wx_rain[min(len(wx_rain) - 1, t // 5)] == 1 else 0
+		n_events += 1
+
+		# FlightAgent.step: requests for flights scheduled within the next 10 minutes
+		lo = np.searchsorted(sched, t, side="left")
+		hi = np.searchsorted(sched, t + 10, side="left")
+		for i in range(lo, hi):
+			req_slot = max(0, sched[i] + delay[i] + int(bias[i]) + wx_extra) // 5
+			n_req += 1
+			n_events += 1
+
+			# RunwayAgent.on_request: earliest free runway in the next three slots
+			if req_slot + 3 > rwy_busy.shape[0]:
+				rwy_busy = _grow(rwy_busy, req_slot + 3)
+			s = -1
+			for cand in range(req_slot, req_slot + 3):
+				for r in range(n_runways):
+					if not rwy_busy[cand, r]:
+						rwy_busy[cand, r] = True
+						s = cand
+						break
+				if s >= 0:
+					break
+			if s < 0:
+				continue
+			n_rwy += 1
+			n_events += 1
+
+			# GateAgent.on_runway_assigned (runway.assigned is published before runway.deferred)
+			if s + 3 > gate_busy.shape[0]:
+				gate_busy = _grow(gate_busy, s + 3)
+			claimed = False
+			for cand in range(s, s + 3):
+				for g in range(n_gates):
+					if not gate_busy[cand, g]:
+						gate_busy[cand, g] = True
+						claimed = True
+						break
+				if claimed:
+					break
+			if claimed:
+				n_gate += 1
+				n_events += 1
+
+			# FlightAgent.on_deferred
+			if s > req_slot:
+				n_events += 1
+				bias[i] += (s - req_slot) * 5 * 0.5
+				if seen[i] < 0:
+					seen[i] = stamp
+					stamp += 1
+	return n_req, n_rwy, n_gate, n_events, stamp
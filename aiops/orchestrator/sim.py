@@ -1,15 +1,19 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Dict, List, Any
+from itertools import islice
+from operator import attrgetter
+from typing import Dict, Iterator, List, Any, Tuple
 
+import numpy as np
 import pandas as pd
 
 from aiops.config import Config
 from aiops.ingestion.data_sources import DataIngestion
 from aiops.prediction.models import DelayPredictionModel
-from aiops.agents.core import EventBus
+from aiops.agents.core import Event, EventBus
 from aiops.agents.agents import WeatherAgent, FlightAgent, RunwayAgent, GateAgent
+from aiops.orchestrator.kernel import _simulate
 
 
 @dataclass
@@ -20,6 +24,24 @@ class SimulationMetrics:
 	logs: List[Dict[str, Any]]
 
 
+def _log_records(log: List[Event]) -> List[Dict[str, Any]]:
+	# Flat dict per event; payload fields are read with one attrgetter per payload class
+	# (dataclasses.asdict would deep-copy every payload)
+	readers: Dict[type, Tuple[Tuple[str, ...], Any]] = {}
+	records = []
+	for e in log:
+		cls = type(e.payload)
+		reader = readers.get(cls)
+		if reader is None:
+			names = cls.__slots__
+			get = attrgetter(*names)
+			reader = readers[cls] = (names, get if len(names) > 1 else lambda p, get=get: (get(p),))
+		rec = {"time_min": e.time_min, "type": e.type}
+		rec.update(zip(reader[0], reader[1](e.payload)))
+		records.append(rec)
+	return records
+
+
 class Simulation:
 	def __init__(self, config: Config) -> None:
 		self.config = config
@@ -31,13 +53,13 @@ class Simulation:
 		data = DataIngestion(self.config).simulate()
 		pred = DelayPredictionModel(self.config)
 		pred.fit(data.flights, data.weather)
-		delay_series = pred.predict(data.flights, data.weather).per_flight_minutes.to_dict()
+		delays = pred.predict(data.flights, data.weather).per_flight_minutes.reindex(data.flights["flight_id"]).fillna(0).to_numpy()
 
 		# Agents
 		weather = WeatherAgent(self.bus, data.weather)
-		flights = FlightAgent(self.bus, data.flights, delay_series)
-		runways = RunwayAgent(self.bus, list(data.runways["runway_id"]))
-		gates = GateAgent(self.bus, data.gates)
+		flights = FlightAgent(self.bus, data.flights, delays)
+		runways = RunwayAgent(self.bus, list(data.runways["runway_id"]), horizon_minutes)
+		gates = GateAgent(self.bus, data.gates, horizon_minutes)
 
 		# Simulate
 		for t in range(0, horizon_minutes, step_minutes):
@@ -46,10 +68,7 @@ class Simulation:
 			# Runway and Gate agents react via events
 
 		# Aggregate results
-		rows = []
-		for (slot, rwy), fid in runways.occupied.items():
-			rows.append({"flight_id": fid, "runway_id": rwy, "slot": slot})
-		assign_df = pd.DataFrame(rows)
+		assign_df = pd.DataFrame([{"flight_id": fid, "runway_id": rwy, "slot": slot} for slot, rwy, fid in runways.rows()])
 		self.metrics.assignments = assign_df
 		self.metrics.decisions = {
 			"WeatherAgent": weather.decisions,
@@ -57,45 +76,58 @@ class Simulation:
 			"RunwayAgent": runways.decisions,
 			"GateAgent": gates.decisions,
 		}
-		self.metrics.num_events = len(self.bus.log)
-		self.metrics.logs = [{"time_min": e.time_min, "type": e.type, **{k: v for k, v in e.payload.items()}} for e in self.bus.log]
+		self.metrics.num_events = self.bus.num_events
+		self.metrics.logs = _log_records(self.bus.log)
 		return self.metrics
 
 	def run_with_learning(self, episodes: int = 3, horizon_minutes: int = 240, step_minutes: int = 5) -> Dict[str, any]:
 		history = []
-		bias: Dict[str, float] = {}
-		for ep in range(episodes):
-			data = DataIngestion(self.config).simulate()
-			pred = DelayPredictionModel(self.config)
-			pred.fit(data.flights, data.weather)
-			delay_series = pred.predict(data.flights, data.weather).per_flight_minutes.to_dict()
-
-			bus = EventBus()
-			weather = WeatherAgent(bus, data.weather)
-			flights = FlightAgent(bus, data.flights, delay_series, bias=bias)
-			runways = RunwayAgent(bus, list(data.runways["runway_id"]))
-			gates = GateAgent(bus, data.gates)
-
-			for t in range(0, horizon_minutes, step_minutes):
-				weather.step(t)
-				flights.step(t)
-
-			# update bias from learned deferrals
-			bias.update(flights.bias)
-
-			history.append({
-				"episode": ep + 1,
-				"decisions": {
-					"WeatherAgent": weather.decisions,
-					"FlightAgent": flights.decisions,
-					"RunwayAgent": runways.decisions,
-					"GateAgent": gates.decisions,
-				},
-				"events": len(bus.log),
-				"assignments": len(runways.occupied),
-				"avg_bias_min": float(pd.Series(list(bias.values())).mean()) if bias else 0.0,
-			})
-
-		return {"episodes": history, "final_bias": bias}
+		final_bias: Dict[str, float] = {}
+		for entry, final_bias in islice(self.learning_episodes(horizon_minutes, step_minutes), max(0, episodes)):
+			history.append(entry)
+		return {"episodes": history, "final_bias": final_bias}
 
+	def learning_episodes(self, horizon_minutes: int = 240, step_minutes: int = 5) -> Iterator[Tuple[Dict[str, Any], Dict[str, float]]]:
+		# Endless episodes, each continuing from the biases learned so far; yields the
+		# episode's entry and the learned biases as they stand after it.
 
+		# Data and delay predictions are seeded from the config, so they are identical every episode
+		data = DataIngestion(self.config).simulate()
+		pred = DelayPredictionModel(self.config)
+		pred.fit(data.flights, data.weather)
+		delays = pred.predict(data.flights, data.weather).per_flight_minutes
+
+		# Only counts and learned biases are reported, so episodes run on the array
+		# kernel instead of the event bus; flights are encoded by sched_min order.
+		flights = data.flights.sort_values("sched_min", kind="stable")
+		fids = flights["flight_id"].to_numpy(object)
+		sched = flights["sched_min"].to_numpy(np.int64)
+		delay = delays.reindex(fids).fillna(0).to_numpy().astype(np.int64)
+		wx_rain = data.weather["rain"].to_numpy(np.int64)
+		n_runways = len(data.runways)
+		n_gates = max(1, len(data.gates))
+		bias = np.zeros(len(fids))
+		seen = np.full(len(fids), -1, dtype=np.int64)
+		stamp = 0
+
+		ep = 0
+		while True:
+			n_req, n_rwy, n_gate, n_events, stamp = _simulate(sched, delay, bias, seen, stamp, wx_rain, n_runways, n_gates, horizon_minutes, step_minutes)
+			learned = bias[seen >= 0]
+			ep += 1
+			entry = {
+				"episode": ep,
+				"decisions": {
+					"WeatherAgent": 0,
+					"FlightAgent": int(n_req),
+					"RunwayAgent": int(n_rwy),
+					"GateAgent": int(n_gate),
+				},
+				"events": int(n_events),
+				"assignments": int(n_rwy),
+				"avg_bias_min": float(learned.mean()) if len(learned) else 0.0,
+			}
+
+			# Learned biases keyed by flight, in the order flights were first deferred
+			order = np.argsort(seen, kind="stable")
+			yield entry, {fids[i]: float(bias[i]) for i in order if seen[i] >= 0}
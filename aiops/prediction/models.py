@@ -3,12 +3,17 @@ from __future__ import annotations
 import numpy as np
 import pandas as pd
 from dataclasses import dataclass
-from sklearn.ensemble import RandomForestRegressor
-from typing import Tuple
+from sklearn.ensemble import HistGradientBoostingRegressor
+from typing import Dict, Tuple
 
 from aiops.config import Config
 
 
+# Column positions in the feature matrix built by DelayPredictionModel._make_features
+_IS_WIDE = 2
+_RAIN = 4
+
+
 @dataclass
 class DelayPredictions:
 	per_flight_minutes: pd.Series
@@ -18,22 +23,31 @@ class DelayPredictions:
 class DelayPredictionModel:
 	def __init__(self, config: Config) -> None:
 		self.config = config
-		self.model = RandomForestRegressor(n_estimators=100, random_state=config.seed)
+		# Training sets are tens of flights, so leaves are kept small enough to still split
+		self.model = HistGradientBoostingRegressor(max_iter=50, min_samples_leaf=5, random_state=config.seed)
 		self._is_trained = False
+		# Feature matrix for the most recent (flights, weather) pair, so fit() then
+		# predict() on the same frames builds it once. Entries hold the frames to pin their ids.
+		self._feature_cache: Dict[Tuple[int, int], Tuple[pd.DataFrame, pd.DataFrame, np.ndarray]] = {}
 
-	def _make_features(self, flights: pd.DataFrame, weather: pd.DataFrame) -> pd.DataFrame:
-		# Simple join on nearest time slot
-		weather_idx = (flights["sched_min"] // self.config.time_slot_minutes).clip(0, len(weather) - 1)
-		wx = weather.iloc[weather_idx.values].reset_index(drop=True)
-		X = pd.DataFrame(
-			{
-				"sched_min": flights["sched_min"].values,
-				"is_arr": (flights["op"] == "ARR").astype(int).values,
-				"is_wide": (flights["aircraft"] == "WIDE").astype(int).values,
-				"wind": wx["wind"].values,
-				"rain": wx["rain"].values,
-			}
-		)
+	def _make_features(self, flights: pd.DataFrame, weather: pd.DataFrame) -> np.ndarray:
+		key = (id(flights), id(weather))
+		hit = self._feature_cache.get(key)
+		if hit is not None:
+			return hit[2]
+		# Simple join on nearest time slot, gathered straight from the weather columns
+		sched_min = flights["sched_min"].to_numpy()
+		idx = np.clip(sched_min // self.config.time_slot_minutes, 0, len(weather) - 1)
+		# Columns: sched_min, is_arr, is_wide, wind, rain
+		X = np.column_stack([
+			sched_min,
+			(flights["op"] == "ARR").to_numpy(dtype=np.int8),
+			(flights["aircraft"] == "WIDE").to_numpy(dtype=np.int8),
+			weather["wind"].to_numpy()[idx],
+			weather["rain"].to_numpy()[idx],
+		])
+		self._feature_cache.clear()
+		self._feature_cache[key] = (flights, weather, X)
 		return X
 
 	def fit(self, flights: pd.DataFrame, weather: pd.DataFrame) -> None:
@@ -42,8 +56,8 @@ class DelayPredictionModel:
 		# Synthetic target: base + rain penalty + wide-body handling variance
 		y = (
 			np.random.normal(self.config.base_delay_mean, self.config.base_delay_std, size=len(X))
-			+ X["rain"].values * self.config.weather_delay_multiplier * 2.0
-			+ X["is_wide"].values * 1.5
+			+ X[:, _RAIN] * self.config.weather_delay_multiplier * 2.0
+			+ X[:, _IS_WIDE] * 1.5
 		)
 		self.model.fit(X, y)
 		self._is_trained = True
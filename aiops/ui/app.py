@@ -1,83 +1,182 @@
 from __future__ import annotations
 
+import csv
+import dataclasses
+import html
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Dict, List, Tuple, Union
+
 import streamlit as st
+import numpy as np
 import pandas as pd
-import plotly.express as px
-import plotly.io as pio
-import io
-import zipfile
+import time
 
+from aiops.agents.agents import LOG_COLUMNS
 from aiops.config import Config
 from aiops.orchestrator.pipeline import AirportOpsPipeline
 from aiops.orchestrator.sim import Simulation
 
+# plotly, zipfile and io are imported where charts and report bundles are built, so
+# sessions that never reach those sections don't pay for loading them
+if TYPE_CHECKING:
+	import zipfile
 
-st.set_page_config(page_title="Airport Ops AI Workflow", layout="wide")
-st.title("Airport Operations AI Workflow")
+	import plotly.graph_objects as go
 
-with st.sidebar:
-	st.header("Parameters")
-	num_flights = st.slider("Flights", 10, 100, 30, step=2)
-	num_runways = st.slider("Runways", 1, 4, 2)
-	num_gates = st.slider("Gates", 2, 20, 10)
-	seed = st.number_input("Seed", min_value=0, value=42, step=1)
-	st.divider()
-	st.header("Constraints")
-	enable_runway_sep = st.checkbox("Enforce runway separation", value=False)
-	runway_sep = st.slider("Runway separation (min)", 1, 10, 5)
-	enable_gate_turn = st.checkbox("Enforce gate turnaround", value=False)
-	gate_turn = st.slider("Gate turnaround (min)", 5, 60, 15, step=5)
-	if st.button("Run Workflow"):
-		cfg = Config(
-			num_flights=num_flights,
-			num_runways=num_runways,
-			num_gates=num_gates,
-			seed=seed,
-			enable_runway_separation=enable_runway_sep,
-			runway_separation_minutes=runway_sep,
-			enable_gate_turnaround=enable_gate_turn,
-			gate_turnaround_minutes=gate_turn,
-		)
-		pipeline = AirportOpsPipeline(cfg)
-		out = pipeline.run_once()
-		st.session_state["output"] = out
 
-out = st.session_state.get("output")
-if out is not None:
-	col1, col2, col3 = st.columns(3)
-	with col1:
-		st.metric("Status", out.schedule.status)
-		st.metric("Objective", f"{out.schedule.objective_value:.2f}")
-	with col2:
-		st.metric("Mean Pred Delay (min)", f"{out.mean_predicted_delay:.2f}")
-		st.metric("Latency (s)", f"{out.latency_seconds:.2f}")
-	with col3:
-		st.metric("Flights", len(out.schedule.runway_assignments))
-		st.metric("Taxiway Conflicts", len(out.schedule.taxiway_conflicts))
+_SLOT_ANCHOR = np.datetime64("2000-01-01T00:00", "m")
+
+
+def _slot_starts(slots: np.ndarray) -> np.ndarray:
+	# 5-minute slots as start datetimes from a fixed anchor, for nicer axis labels
+	return _SLOT_ANCHOR + slots.astype("timedelta64[m]") * 5
+
+
+# Static chart: no hover/zoom handlers to wire up per bar
+_TIMELINE_CONFIG = {"staticPlot": True, "displayModeBar": False}
+# Shared layout, passed whole to the constructor rather than applied through update_* calls
+_TIMELINE_LAYOUT = {"xaxis": {"type": "date", "title": {"text": "Time"}}, "yaxis": {"autorange": "reversed"}}
+
+
+def _timeline_fig(assignments: pd.DataFrame, title: str) -> go.Figure:
+	# One horizontal bar trace for all flights (px.timeline makes a trace per flight);
+	# on a date axis the bar length is in milliseconds
+	import plotly.graph_objects as go
+
+	start = _slot_starts(assignments["slot"].to_numpy())
+	bar = go.Bar(
+		orientation="h",
+		base=start,
+		x=np.full(len(start), 5 * 60 * 1000),
+		y=assignments["runway_id"],
+		text=assignments["flight_id"],
+		textposition="inside",
+	)
+	return go.Figure(data=[bar], layout={**_TIMELINE_LAYOUT, "title": {"text": title}})
+
+
+_CATEGORICAL = ("flight_id", "runway_id")
+
+
+def _compact(df: pd.DataFrame) -> pd.DataFrame:
+	# Narrowest integer dtype per column and dictionary-encoded ids, so Arrow ships fewer
+	# bytes to the browser
+	cols = {c: pd.to_numeric(df[c], downcast="integer") for c in df.select_dtypes("integer").columns}
+	cols.update({c: df[c].astype("category") for c in _CATEGORICAL if c in df.columns})
+	return df.assign(**cols) if cols else df
+
+
+def _metrics_html(items: List[Tuple[str, object]]) -> str:
+	# One markdown element for the whole metrics panel instead of an element per metric,
+	# laid out three across like the st.columns/st.metric version
+	cells = "".join(
+		f'<div><div style="font-size:0.875rem;opacity:0.6">{html.escape(label)}</div>'
+		f'<div style="font-size:2.25rem">{html.escape(str(value))}</div></div>'
+		for label, value in items
+	)
+	return f'<div style="display:grid;grid-template-columns:repeat(3,1fr);gap:1rem">{cells}</div>'
+
+
+def _write_csv(z: zipfile.ZipFile, name: str, df: pd.DataFrame) -> None:
+	# Stream the CSV into a stored entry rather than materializing it as one string first
+	import io
+	import zipfile
+
+	info = zipfile.ZipInfo(name, date_time=time.localtime()[:6])
+	with z.open(info, "w") as raw, io.TextIOWrapper(raw, encoding="utf-8", newline="") as f:
+		df.to_csv(f, index=False)
+
+
+# Figures hash by their JSON (cheap next to HTML rendering), so repeated downloads of
+# unchanged results reuse the finished bundle (keyed by type name so plotly stays unimported)
+@st.cache_data(show_spinner=False, hash_funcs={"plotly.graph_objs._figure.Figure": lambda f: f.to_json()})
+def _zip_bundle(csvs: Dict[str, Union[pd.DataFrame, str]], pages: Dict[str, go.Figure]) -> bytes:
+	# Fast deflate for the HTML, CSVs stored as-is. Pages render on worker threads while
+	# the CSVs stream in; every ZIP write stays on this thread (ZipFile is not thread-safe).
+	import io
+	import zipfile
+
+	import plotly.io as pio
+
+	buf = io.BytesIO()
+	with ThreadPoolExecutor(max_workers=max(1, len(pages))) as pool:
+		pages_html = {name: pool.submit(pio.to_html, fig, full_html=True, include_plotlyjs="cdn") for name, fig in pages.items()}
+		with zipfile.ZipFile(buf, mode="w", compression=zipfile.ZIP_DEFLATED, compresslevel=1) as z:
+			for name, data in csvs.items():
+				if isinstance(data, str):
+					z.writestr(name, data, compress_type=zipfile.ZIP_STORED)
+				else:
+					_write_csv(z, name, data)
+			for name, fut in pages_html.items():
+				z.writestr(name, fut.result())
+	return buf.getvalue()
+
+
+# Streamlit reruns this script on every interaction; the heavy calls are cached on
+# the Config field tuple (plus run arguments) so unchanged parameters skip the work.
+@st.cache_data(show_spinner=False)
+def _run_pipeline(cfg_fields: tuple):
+	return AirportOpsPipeline(Config(*cfg_fields)).run_once()
+
+
+@st.cache_data(show_spinner=False)
+def _run_sim(cfg_fields: tuple, horizon_minutes: int):
+	return Simulation(Config(*cfg_fields)).run(horizon_minutes=horizon_minutes)
+
+
+class _LearningRun:
+	# An open learning run: finished episodes (each with the biases learned after it) and
+	# the generator that continues from the last one
+	def __init__(self, cfg_fields: tuple, horizon_minutes: int) -> None:
+		self.lock = threading.Lock()
+		self.episodes = Simulation(Config(*cfg_fields)).learning_episodes(horizon_minutes=horizon_minutes)
+		self.done: List[Tuple[dict, dict]] = []
+
+
+# Episodes build on each other's biases, so the run is kept open and only the missing
+# tail is simulated when the episode count goes up
+@st.cache_resource(show_spinner=False)
+def _learning_run(cfg_fields: tuple, horizon_minutes: int) -> _LearningRun:
+	return _LearningRun(cfg_fields, horizon_minutes)
+
+
+def _run_learning(cfg_fields: tuple, horizon_minutes: int, episodes: int):
+	run = _learning_run(cfg_fields, horizon_minutes)
+	with run.lock:
+		while len(run.done) < episodes:
+			run.done.append(next(run.episodes))
+		done = run.done[:episodes]
+	return {"episodes": [entry for entry, _ in done], "final_bias": done[-1][1] if done else {}}
+
+
+# Conflict keys and the display frame only change with the schedule, so sidebar reruns
+# reuse them; the Styler itself wraps the cached pieces
+@st.cache_data(show_spinner=False)
+def _conflict_view(runway_df: pd.DataFrame, conflicts: pd.DataFrame) -> Tuple[pd.DataFrame, np.ndarray]:
+	rwy, slot = conflicts["runway_id"].to_numpy(), conflicts["slot"].to_numpy()
+	conf_pairs = set(zip(conflicts["flight_id_a"].to_numpy(), rwy, slot)) | set(zip(conflicts["flight_id_b"].to_numpy(), rwy, slot))
+	keys = pd.MultiIndex.from_arrays([runway_df["flight_id"], runway_df["runway_id"], runway_df["slot"]])
+	return _compact(runway_df), keys.isin(list(conf_pairs))
+
+
+def _render_schedule(out) -> None:
+	st.markdown(_metrics_html([
+		("Status", out.schedule.status),
+		("Mean Pred Delay (min)", f"{out.mean_predicted_delay:.2f}"),
+		("Flights", len(out.schedule.runway_assignments)),
+		("Objective", f"{out.schedule.objective_value:.2f}"),
+		("Latency (s)", f"{out.latency_seconds:.2f}"),
+		("Taxiway Conflicts", len(out.schedule.taxiway_conflicts)),
+	]), unsafe_allow_html=True)
 
 	st.subheader("Runway Assignments")
-	st.dataframe(out.schedule.runway_assignments)
+	st.dataframe(_compact(out.schedule.runway_assignments))
 
 	# Timeline chart for runway schedule
 	if not out.schedule.runway_assignments.empty:
-		df_tl = out.schedule.runway_assignments.copy()
-		# Convert 5-minute slots to minutes since t0, then to datetimes for nicer axis labels
-		df_tl["start_min"] = df_tl["slot"] * 5
-		df_tl["end_min"] = df_tl["start_min"] + 5
-		anchor = pd.Timestamp("2000-01-01 00:00:00")
-		df_tl["start"] = pd.to_datetime(df_tl["start_min"], unit="m", origin=anchor)
-		df_tl["end"] = pd.to_datetime(df_tl["end_min"], unit="m", origin=anchor)
-		fig = px.timeline(
-			df_tl,
-			x_start="start",
-			x_end="end",
-			y="runway_id",
-			color="flight_id",
-			title="Runway Schedule (5-min slots)",
-		)
-		fig.update_yaxes(autorange="reversed")
-		fig.update_layout(xaxis_title="Time")
-		st.plotly_chart(fig, use_container_width=True)
+		fig = _timeline_fig(out.schedule.runway_assignments, "Runway Schedule (5-min slots)")
+		st.plotly_chart(fig, use_container_width=True, config=_TIMELINE_CONFIG)
 
 	st.subheader("Gate Assignments")
 	st.dataframe(out.schedule.gate_assignments)
@@ -85,8 +184,7 @@ if out is not None:
 	if not out.schedule.taxiway_conflicts.empty:
 		st.subheader("Taxiway Conflicts")
 		st.warning("Potential conflicts detected")
-		df_conf = out.schedule.taxiway_conflicts.copy()
-		st.dataframe(df_conf)
+		st.dataframe(_compact(out.schedule.taxiway_conflicts))
 
 	if out.alerts:
 		st.subheader("Alerts")
@@ -95,83 +193,115 @@ if out is not None:
 
 	# Highlight conflicting rows in runway assignment table
 	if not out.schedule.taxiway_conflicts.empty and not out.schedule.runway_assignments.empty:
-		conf_pairs = set()
-		for _, row in out.schedule.taxiway_conflicts.iterrows():
-			conf_pairs.add((row["flight_id_a"], row["runway_id"], row["slot"]))
-			conf_pairs.add((row["flight_id_b"], row["runway_id"], row["slot"]))
-		df = out.schedule.runway_assignments.copy()
-		def row_style(r):
-			key = (r["flight_id"], r["runway_id"], r["slot"])
-			return ["background-color: #ffe6e6" if key in conf_pairs else ""] * len(r)
+		df, conflict_rows = _conflict_view(out.schedule.runway_assignments, out.schedule.taxiway_conflicts)
+		def conflict_style(frame):
+			# One call for the whole frame instead of one per row
+			css = pd.DataFrame("", index=frame.index, columns=frame.columns)
+			css.loc[conflict_rows, :] = "background-color: #ffe6e6"
+			return css
 		st.subheader("Runway Assignments (highlight conflicts)")
-		st.dataframe(df.style.apply(row_style, axis=1))
+		st.dataframe(df.style.apply(conflict_style, axis=None))
 
-else:
-	st.info("Set parameters and click 'Run Workflow' in the sidebar.")
 
-st.divider()
-st.header("Multi-Agent Simulation")
-sim_minutes = st.slider("Simulation horizon (minutes)", 30, 480, 120, step=30)
-if st.button("Run Simulation"):
-	sim = Simulation(Config())
-	metrics = sim.run(horizon_minutes=sim_minutes)
+# A fragment: the report download inside reruns only this view, not the whole page
+@st.fragment
+def _render_simulation(metrics) -> None:
 	st.subheader("Agent Decisions")
 	st.json(metrics.decisions)
 	st.metric("Events", metrics.num_events)
 	if not metrics.assignments.empty:
 		st.subheader("Assignments from Simulation")
-		st.dataframe(metrics.assignments)
+		st.dataframe(_compact(metrics.assignments))
 		# Build a simple timeline figure from simulation assignments
-		df_sim = metrics.assignments.copy()
-		df_sim["start_min"] = df_sim["slot"] * 5
-		df_sim["end_min"] = df_sim["start_min"] + 5
-		anchor = pd.Timestamp("2000-01-01 00:00:00")
-		df_sim["start"] = pd.to_datetime(df_sim["start_min"], unit="m", origin=anchor)
-		df_sim["end"] = pd.to_datetime(df_sim["end_min"], unit="m", origin=anchor)
-		fig_sim = px.timeline(df_sim, x_start="start", x_end="end", y="runway_id", color="flight_id", title="Simulation Runway Schedule")
-		fig_sim.update_yaxes(autorange="reversed")
-		st.plotly_chart(fig_sim, use_container_width=True)
+		fig_sim = _timeline_fig(metrics.assignments, "Simulation Runway Schedule")
+		st.plotly_chart(fig_sim, use_container_width=True, config=_TIMELINE_CONFIG)
 	logs = getattr(metrics, "logs", [])
 	if logs:
 		st.subheader("Agent Event Log")
-		log_df = pd.DataFrame(logs)
-		st.dataframe(log_df.tail(100))
+		# Only the last 100 events are shown; the full frame is built for the export alone
+		tail_start = max(0, len(logs) - 100)
+		st.dataframe(_compact(pd.DataFrame.from_records(logs[tail_start:], index=range(tail_start, len(logs)), columns=LOG_COLUMNS)))
+		log_df = pd.DataFrame.from_records(logs, columns=LOG_COLUMNS)
 
 		# Export report bundle (ZIP)
-		buf = io.BytesIO()
-		with zipfile.ZipFile(buf, mode="w", compression=zipfile.ZIP_DEFLATED) as z:
-			z.writestr("logs.csv", log_df.to_csv(index=False))
-			z.writestr("assignments.csv", metrics.assignments.to_csv(index=False))
-			z.writestr("timeline.html", pio.to_html(fig_sim, full_html=True, include_plotlyjs="cdn"))
-		st.download_button("Download simulation report (ZIP)", data=buf.getvalue(), file_name="simulation_report.zip", mime="application/zip")
+		report = _zip_bundle({"logs.csv": log_df, "assignments.csv": metrics.assignments}, {"timeline.html": fig_sim})
+		st.download_button("Download simulation report (ZIP)", data=report, file_name="simulation_report.zip", mime="application/zip")
+
+
+@st.fragment
+def _render_learning_report(hist: pd.DataFrame, final_bias: Dict[str, float]) -> None:
+	# The report figures are only built on request, and the button reruns just this part
+	if not st.button("Prepare learning report"):
+		return
+	import io
+
+	import plotly.express as px
+
+	fig_events = px.bar(hist, x="episode", y="events", title="Events per Episode")
+	fig_assign = px.bar(hist, x="episode", y="assignments", title="Assignments per Episode")
+	# A two-column dict needs no DataFrame to become CSV
+	bias_csv = io.StringIO()
+	writer = csv.writer(bias_csv, lineterminator="\n")
+	writer.writerow(["flight_id", "bias_min"])
+	writer.writerows(final_bias.items())
+	report = _zip_bundle(
+		{"episodes.csv": hist, "final_bias.csv": bias_csv.getvalue()},
+		{"events_bar.html": fig_events, "assignments_bar.html": fig_assign},
+	)
+	st.download_button("Download learning report (ZIP)", data=report, file_name="learning_report.zip", mime="application/zip")
+
+
+st.set_page_config(page_title="Airport Ops AI Workflow", layout="wide")
+st.title("Airport Operations AI Workflow")
+
+with st.sidebar:
+	st.header("Parameters")
+	num_flights = st.slider("Flights", 10, 100, 30, step=2)
+	num_runways = st.slider("Runways", 1, 4, 2)
+	num_gates = st.slider("Gates", 2, 20, 10)
+	seed = st.number_input("Seed", min_value=0, value=42, step=1)
+	st.divider()
+	st.header("Constraints")
+	enable_runway_sep = st.checkbox("Enforce runway separation", value=False)
+	runway_sep = st.slider("Runway separation (min)", 1, 10, 5)
+	enable_gate_turn = st.checkbox("Enforce gate turnaround", value=False)
+	gate_turn = st.slider("Gate turnaround (min)", 5, 60, 15, step=5)
+	if st.button("Run Workflow"):
+		cfg = Config(
+			num_flights=num_flights,
+			num_runways=num_runways,
+			num_gates=num_gates,
+			seed=seed,
+			enable_runway_separation=enable_runway_sep,
+			runway_separation_minutes=runway_sep,
+			enable_gate_turnaround=enable_gate_turn,
+			gate_turnaround_minutes=gate_turn,
+		)
+		st.session_state["output"] = _run_pipeline(dataclasses.astuple(cfg))
+
+out = st.session_state.get("output")
+if out is not None:
+	_render_schedule(out)
+else:
+	st.info("Set parameters and click 'Run Workflow' in the sidebar.")
+
+st.divider()
+st.header("Multi-Agent Simulation")
+sim_minutes = st.slider("Simulation horizon (minutes)", 30, 480, 120, step=30)
+if st.button("Run Simulation"):
+	_render_simulation(_run_sim(dataclasses.astuple(Config()), sim_minutes))
 
 st.subheader("Adaptive Learning (multi-episode)")
 episodes = st.slider("Episodes", 1, 10, 3)
 if st.button("Run Learning Simulation"):
-	sim = Simulation(Config())
-	res = sim.run_with_learning(episodes=episodes, horizon_minutes=sim_minutes)
+	st.session_state["learning"] = _run_learning(dataclasses.astuple(Config()), sim_minutes, episodes)
+# Kept in session state so the report button below can be clicked after the run
+res = st.session_state.get("learning")
+if res is not None:
 	st.json(res)
 	# Plot improvement proxy: events and assignments per episode
 	hist = pd.DataFrame(res["episodes"])
 	if not hist.empty:
-		c1, c2 = st.columns(2)
-		with c1:
-			st.subheader("Events per Episode")
-			st.bar_chart(hist.set_index("episode")["events"])
-		with c2:
-			st.subheader("Assignments per Episode")
-			st.bar_chart(hist.set_index("episode")["assignments"])
-
-		# Export learning report bundle (ZIP)
-		fig_events = px.bar(hist, x="episode", y="events", title="Events per Episode")
-		fig_assign = px.bar(hist, x="episode", y="assignments", title="Assignments per Episode")
-		buf2 = io.BytesIO()
-		with zipfile.ZipFile(buf2, mode="w", compression=zipfile.ZIP_DEFLATED) as z:
-			z.writestr("episodes.csv", hist.to_csv(index=False))
-			final_bias = pd.DataFrame(list(res.get("final_bias", {}).items()), columns=["flight_id", "bias_min"]) if res.get("final_bias") else pd.DataFrame(columns=["flight_id", "bias_min"])
-			z.writestr("final_bias.csv", final_bias.to_csv(index=False))
-			z.writestr("events_bar.html", pio.to_html(fig_events, full_html=True, include_plotlyjs="cdn"))
-			z.writestr("assignments_bar.html", pio.to_html(fig_assign, full_html=True, include_plotlyjs="cdn"))
-		st.download_button("Download learning report (ZIP)", data=buf2.getvalue(), file_name="learning_report.zip", mime="application/zip")
-
-
+		st.subheader("Events and Assignments per Episode")
+		st.bar_chart(hist.set_index("episode")[["events", "assignments"]], stack=False)
+		_render_learning_report(hist, res.get("final_bias", {}))
@@ -1,18 +1,52 @@
 import logging
+import os
 import sys
+from typing import Dict
+
+
+class _SecondCachedFormatter(logging.Formatter):
+	# The date format has one-second resolution, so reuse the last formatted second
+	_last = (None, "")
+
+	def formatTime(self, record: logging.LogRecord, datefmt=None) -> str:
+		sec = int(record.created)
+		last_sec, text = self._last
+		if sec != last_sec:
+			text = super().formatTime(record, datefmt)
+			self._last = (sec, text)
+		return text
+
+
+_FORMATTER = _SecondCachedFormatter(
+	"%(asctime)s | %(levelname)s | %(name)s | %(message)s",
+	datefmt="%H:%M:%S",
+)
+
+
+def _env_level() -> int:
+	# LOG_LEVEL may be a level name or number; anything unrecognised falls back to INFO
+	value = os.environ.get("LOG_LEVEL", "INFO").strip()
+	try:
+		return int(value)
+	except ValueError:
+		level = logging.getLevelName(value.upper())
+		return level if isinstance(level, int) else logging.INFO
+
+
+# Loggers handed out so far; repeat lookups skip logging's module lock
+_CACHE: Dict[str, logging.Logger] = {}
 
 
 def get_logger(name: str) -> logging.Logger:
+	cached = _CACHE.get(name)
+	if cached is not None:
+		return cached
 	logger = logging.getLogger(name)
 	if not logger.handlers:
 		handler = logging.StreamHandler(stream=sys.stdout)
-		formatter = logging.Formatter(
-			"%(asctime)s | %(levelname)s | %(name)s | %(message)s",
-			datefmt="%H:%M:%S",
-		)
-		handler.setFormatter(formatter)
+		handler.setFormatter(_FORMATTER)
 		logger.addHandler(handler)
-		logger.setLevel(logging.INFO)
+		logger.setLevel(_env_level())
 	logger.propagate = False
+	_CACHE[name] = logger
 	return logger
-
@@ -1,12 +1,91 @@
+import subprocess
+import sys
+
+import pandas as pd
+import pytest
+
+from aiops.agents.agents import LOG_COLUMNS, FlightAgent, GateAgent, RunwayAgent, WeatherAgent
+from aiops.agents.core import EventBus
 from aiops.config import Config
+from aiops.ingestion.data_sources import DataIngestion
 from aiops.orchestrator.pipeline import AirportOpsPipeline
+from aiops.orchestrator.sim import Simulation
+from aiops.prediction.models import DelayPredictionModel
 
 
-def test_pipeline_runs():
+@pytest.fixture(scope="module")
+def pipeline_output():
+	# One solver run shared by every test in the module
 	cfg = Config(num_flights=12, num_runways=2, num_gates=6)
-	p = AirportOpsPipeline(cfg)
-	out = p.run_once()
+	return cfg, AirportOpsPipeline(cfg).run_once()
+
+
+def test_pipeline_runs(pipeline_output):
+	cfg, out = pipeline_output
 	assert out.schedule.status in {"Optimal", "Feasible", "Not Solved"}
 	assert len(out.schedule.runway_assignments) == cfg.num_flights
 	assert len(out.schedule.gate_assignments) == cfg.num_flights
 
+
+def test_learning_episode_matches_event_simulation():
+	cfg = Config()
+	metrics = Simulation(cfg).run(horizon_minutes=240)
+	first = Simulation(cfg).run_with_learning(episodes=1, horizon_minutes=240)["episodes"][0]
+	assert first["decisions"] == metrics.decisions
+	assert first["events"] == metrics.num_events
+	assert first["assignments"] == len(metrics.assignments)
+
+
+def test_log_columns_cover_simulation_log():
+	logs = Simulation(Config()).run(horizon_minutes=120).logs
+	assert list(pd.DataFrame(logs).columns) == LOG_COLUMNS
+
+
+def _learning_via_agents(cfg, episodes, horizon_minutes, step_minutes=5):
+	# Reference for the learning kernel: the event-driven agents, with learned biases
+	# carried from one episode into the next
+	data = DataIngestion(cfg).simulate()
+	pred = DelayPredictionModel(cfg)
+	pred.fit(data.flights, data.weather)
+	delays = pred.predict(data.flights, data.weather).per_flight_minutes.reindex(data.flights["flight_id"]).fillna(0).to_numpy()
+	bias = {}
+	history = []
+	for ep in range(episodes):
+		bus = EventBus()
+		weather = WeatherAgent(bus, data.weather)
+		flights = FlightAgent(bus, data.flights, delays, bias=bias)
+		runways = RunwayAgent(bus, list(data.runways["runway_id"]), horizon_minutes)
+		gates = GateAgent(bus, data.gates, horizon_minutes)
+		for t in range(0, horizon_minutes, step_minutes):
+			weather.step(t)
+			flights.step(t)
+		bias.update(flights.bias)
+		history.append({
+			"episode": ep + 1,
+			"decisions": {
+				"WeatherAgent": weather.decisions,
+				"FlightAgent": flights.decisions,
+				"RunwayAgent": runways.decisions,
+				"GateAgent": gates.decisions,
+			},
+			"events": bus.num_events,
+			"assignments": len(runways.occupied),
+			"avg_bias_min": sum(bias.values()) / len(bias) if bias else 0.0,
+		})
+	return {"episodes": history, "final_bias": bias}
+
+
+@pytest.mark.parametrize("cfg", [Config(), Config(num_flights=60, num_runways=1, num_gates=4, seed=7)], ids=["default", "congested"])
+def test_learning_episodes_match_agents(cfg):
+	# Several episodes, so biases carry over and deferred flights re-request later slots
+	expected = _learning_via_agents(cfg, episodes=4, horizon_minutes=240)
+	res = Simulation(cfg).run_with_learning(episodes=4, horizon_minutes=240)
+	assert res["episodes"] == expected["episodes"]
+	assert list(res["final_bias"].items()) == list(expected["final_bias"].items())
+
+
+def test_cli_run_logs_before_result():
+	# A real process, so the log handler and the JSON share the actual stdout
+	cmd = [sys.executable, "-c", "from aiops.cli import main; main()", "run", "--flights", "12"]
+	result = subprocess.run(cmd, capture_output=True, text=True, check=True)
+	assert 0 <= result.stdout.index("Ingesting data...") < result.stdout.index('"status"')